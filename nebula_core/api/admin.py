@@ -2,7 +2,6 @@
 # Copyright (c) 2026 Monolink Systems
 # Licensed under AGPLv3 (Nebula Open Source Edition, non-corporate)
 import os
-import re
 from typing import Annotated
 from fastapi import APIRouter, HTTPException, Header, Depends, Request, Form, Response
 from fastapi.responses import HTMLResponse
@@ -10,15 +9,14 @@ from pydantic import BaseModel, StringConstraints, Field
 
 from ..db import get_connection, SYSTEM_DB
 from ..services.user_service import UserService
-from .security import create_session_token
+from .security import SECURE_COOKIE, create_session_token
 from ..utils.mailer import send_test_email
-import pyotp
+from ..utils.security import row_totp_digest, verify_totp_code
 
 router = APIRouter(prefix="/system/internal/core", tags=["System-Security"])
 user_service = UserService()
 
 INTERNAL_AUTH_KEY = os.getenv("NEBULA_INSTALLER_TOKEN", "LOCAL_DEV_KEY_2026")
-TOTP_VALID_WINDOW = max(1, min(int(os.getenv("NEBULA_TOTP_VALID_WINDOW", "2")), 5))
 
 AdminUsername = Annotated[str, StringConstraints(
     min_length=5, 
@@ -42,18 +40,6 @@ class MailTestRequest(BaseModel):
     email: str
 
 
-def _normalize_otp_code(raw_code: str) -> str:
-    return re.sub(r"\D", "", str(raw_code or ""))
-
-
-def _verify_totp_code(secret: str, raw_code: str) -> bool:
-    if not secret:
-        return False
-    code = _normalize_otp_code(raw_code)
-    if len(code) != 6:
-        return False
-    return bool(pyotp.TOTP(str(secret).strip()).verify(code, valid_window=TOTP_VALID_WINDOW))
-
 def verify_internal_access(x_nebula_token: str = Header(None)):
     if not x_nebula_token or x_nebula_token != INTERNAL_AUTH_KEY:
         raise HTTPException(status_code=403, detail="Forbidden")
@@ -63,7 +49,7 @@ async def get_login_page(request: Request):
     return HTMLResponse("<html><body><h3>Nebula Core Admin Login Endpoint</h3></body></html>")
 
 @router.post("/login")
-async def process_login(
+def process_login(
     request: Request,
     response: Response,
     admin_id: str = Form(...),
@@ -82,17 +68,16 @@ async def process_login(
         if bool(user["two_factor_enabled"]):
             if not otp or len(otp.strip()) == 0:
                 raise HTTPException(status_code=401, detail="2FA_REQUIRED")
-            if not _verify_totp_code(user["two_factor_secret"], otp):
+            if not verify_totp_code(user["two_factor_secret"], otp, row_totp_digest(user)):
                 raise HTTPException(status_code=401, detail="INVALID_2FA_CODE")
 
-        secure_cookie = os.getenv("NEBULA_COOKIE_SECURE", "false").strip().lower() == "true"
         response.set_cookie(
             key="nebula_session",
             value=create_session_token(username=admin_id, db_name="system.db"),
             httponly=True,
             max_age=3600,
             samesite="Lax",
-            secure=secure_cookie,
+            secure=SECURE_COOKIE,
         )
         return {"status": "authorized", "admin_id": admin_id}
 
@@ -74,6 +74,7 @@ def _resolve_session_secret() -> str:
 
 SESSION_SECRET = _resolve_session_secret().encode("utf-8")
 SESSION_TTL_SECONDS = int(os.getenv("NEBULA_SESSION_TTL_SECONDS", "3600"))
+SECURE_COOKIE = os.getenv("NEBULA_COOKIE_SECURE", "false").strip().lower() == "true"
 
 
 def _b64url_encode(raw: bytes) -> str:
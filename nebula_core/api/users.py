@@ -2,7 +2,6 @@
 # Copyright (c) 2026 Monolink Systems
 # Licensed under AGPLv3 (Nebula Open Source Edition, non-corporate)
 import os
-import re
 import sqlite3
 import hashlib
 import hmac
@@ -13,6 +12,7 @@ import time
 from datetime import datetime, timedelta, timezone
 
 from fastapi import APIRouter, HTTPException, Query, Form, Response, Depends, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 from ..services.user_service import UserService
 from ..models.user import UserCreate
 from ..db import (
@@ -23,13 +23,22 @@ from ..db import (
     normalize_client_db_name,
     resolve_client_db_path,
 )
-from .security import create_session_token, require_session, verify_staff_or_internal
+from .security import SECURE_COOKIE, create_session_token, require_session, verify_staff_or_internal
 from ..utils.mailer import send_password_reset_code
+from ..utils.security import TOTP_DIGEST, forget_totp, row_totp_digest, totp_for, verify_totp_code
 from ..services.security_service import SecurityService
 import bcrypt
+import orjson
 import pyotp
 
-router = APIRouter(prefix="/users", tags=["Users"])
+
+class ORJSONResponse(JSONResponse):
+    # Same options as fastapi.responses.ORJSONResponse, which newer FastAPI releases deprecate.
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+
+router = APIRouter(prefix="/users", tags=["Users"], default_response_class=ORJSONResponse)
 user_service = UserService()
 security_service = SecurityService()
 logger = logging.getLogger("nebula_core.users")
@@ -37,9 +46,21 @@ logger = logging.getLogger("nebula_core.users")
 LOGIN_RATE_WINDOW_SECONDS = int(os.getenv("NEBULA_CORE_LOGIN_WINDOW_SECONDS", "300"))
 LOGIN_RATE_MAX_ATTEMPTS = int(os.getenv("NEBULA_CORE_LOGIN_MAX_ATTEMPTS", "8"))
 LOGIN_RATE_LOCKOUT_SECONDS = int(os.getenv("NEBULA_CORE_LOGIN_LOCKOUT_SECONDS", "900"))
+_PASSWORD_RESET_SECRET = (
+    os.getenv("NEBULA_PASSWORD_RESET_SECRET")
+    or os.getenv("NEBULA_SESSION_SECRET")
+    or os.getenv("NEBULA_INSTALLER_TOKEN")
+    or "nebula-reset-secret-dev"
+)
 _LOGIN_RATE_STATE = {}
 _LOGIN_RATE_LOCK = threading.Lock()
-TOTP_VALID_WINDOW = max(1, min(int(os.getenv("NEBULA_TOTP_VALID_WINDOW", "2")), 5))
+# Formatted with the schema names "main" / "peer" used by _move_user_row.
+_MIGRATE_USER_EXISTS_SQL = "SELECT id FROM {}.users WHERE username=?"
+_MIGRATE_USER_INSERT_SQL = (
+    "INSERT INTO {}.users (username, email, password_hash, is_staff, is_active) VALUES (?, ?, ?, ?, ?)"
+)
+_MIGRATE_USER_DELETE_SQL = "DELETE FROM {}.users WHERE username=?"
+_LIST_USERS_SQL = "SELECT id, username, email, is_staff FROM users"
 
 
 def _session_from_request(request: Request):
@@ -78,6 +99,8 @@ def _get_user_row(conn, username: str):
         select_cols.append("two_factor_secret")
     if "two_factor_enabled" in cols:
         select_cols.append("two_factor_enabled")
+    if "two_factor_digest" in cols:
+        select_cols.append("two_factor_digest")
     return conn.execute(
         f"SELECT {', '.join(select_cols)} FROM users WHERE username=?",
         (username,),
@@ -90,6 +113,8 @@ def _ensure_user_two_factor_columns(conn):
         conn.execute("ALTER TABLE users ADD COLUMN two_factor_secret TEXT")
     if "two_factor_enabled" not in cols:
         conn.execute("ALTER TABLE users ADD COLUMN two_factor_enabled INTEGER DEFAULT 0")
+    if "two_factor_digest" not in cols:
+        conn.execute("ALTER TABLE users ADD COLUMN two_factor_digest TEXT")
     return {r["name"] for r in conn.execute("PRAGMA table_info(users)").fetchall()}
 
 
@@ -105,27 +130,26 @@ def _db_name_variants(db_name: str):
     return [v for v in variants if v]
 
 
-def _normalize_otp_code(raw_code: str) -> str:
-    return re.sub(r"\D", "", str(raw_code or ""))
-
+def _move_user_row(source_path: str, target_path: str, old_name: str, values: tuple) -> None:
+    """Insert `values` into the target sector and delete `old_name` from the source in one transaction.
 
-def _verify_totp_code(secret: str, raw_code: str) -> bool:
-    if not secret:
-        return False
-    code = _normalize_otp_code(raw_code)
-    if len(code) != 6:
-        return False
-    return bool(pyotp.TOTP(str(secret).strip()).verify(code, valid_window=TOTP_VALID_WINDOW))
+    The lower path is always the main database and the other is attached, so BEGIN IMMEDIATE
+    takes both write locks in the same order whichever way the move goes.
+    """
+    source_first = source_path < target_path
+    with get_connection(source_path if source_first else target_path) as conn:
+        conn.execute("ATTACH DATABASE ? AS peer", (target_path if source_first else source_path,))
+        src, dst = ("main", "peer") if source_first else ("peer", "main")
+        conn.execute("BEGIN IMMEDIATE")
+        if conn.execute(_MIGRATE_USER_EXISTS_SQL.format(dst), (values[0],)).fetchone():
+            raise HTTPException(status_code=400, detail="Identity collision in target sector")
+        conn.execute(_MIGRATE_USER_INSERT_SQL.format(dst), values)
+        if conn.execute(_MIGRATE_USER_DELETE_SQL.format(src), (old_name,)).rowcount != 1:
+            raise HTTPException(status_code=404, detail="User not found in source sector")
 
 
 def _hash_reset_code(db_name: str, username: str, code: str) -> str:
-    secret = (
-        os.getenv("NEBULA_PASSWORD_RESET_SECRET")
-        or os.getenv("NEBULA_SESSION_SECRET")
-        or os.getenv("NEBULA_INSTALLER_TOKEN")
-        or "nebula-reset-secret-dev"
-    )
-    payload = f"{db_name}:{username}:{code}:{secret}"
+    payload = f"{db_name}:{username}:{code}:{_PASSWORD_RESET_SECRET}"
     return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
 
@@ -250,6 +274,8 @@ def _fetch_client_login_row(db_name: str, username: str):
             select_cols.append("two_factor_secret")
         if "two_factor_enabled" in cols:
             select_cols.append("two_factor_enabled")
+        if "two_factor_digest" in cols:
+            select_cols.append("two_factor_digest")
         row = conn.execute(
             f"SELECT {', '.join(select_cols)} FROM users WHERE username=?",
             (username,),
@@ -263,19 +289,16 @@ def get_available_databases(_=Depends(verify_staff_or_internal)):
     return {"databases": list_client_databases()}
 
 @router.get("/list")
-def list_users(db_name: str = Query(...), _=Depends(verify_staff_or_internal)):
+def list_users(
+    db_name: str = Query(...),
+    stream: bool = Query(False),
+    _=Depends(verify_staff_or_internal),
+):
     try:
         normalized_db = normalize_client_db_name(db_name)
         db_path, normalized_db = resolve_client_db_path(normalized_db)
         if normalized_db not in list_client_databases():
             raise HTTPException(status_code=404, detail="Database not found")
-        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
-        conn.row_factory = sqlite3.Row
-        try:
-            rows = conn.execute("SELECT id, username, email, is_staff FROM users").fetchall()
-        finally:
-            conn.close()
-        users = [dict(row) for row in rows]
         variants = _db_name_variants(normalized_db)
         with get_connection(SYSTEM_DB) as sys_conn:
             if variants:
@@ -289,13 +312,45 @@ def list_users(db_name: str = Query(...), _=Depends(verify_staff_or_internal)):
             existing = tag_map.get(r["username"])
             if existing is None or r["db_name"] == normalized_db:
                 tag_map[r["username"]] = r["role_tag"]
-        for u in users:
-            u["role_tag"] = tag_map.get(u["username"], "user")
-        return users
+
+        if stream:
+            return StreamingResponse(_stream_user_rows(db_path, tag_map), media_type="application/x-ndjson")
+
+        # Plain tuple rows: the payload dicts are built directly below.
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            rows = conn.execute(_LIST_USERS_SQL).fetchall()
+        finally:
+            conn.close()
+        return [_list_user_payload(r, tag_map) for r in rows]
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+def _list_user_payload(row, tag_map: dict) -> dict:
+    return {
+        "id": row[0],
+        "username": row[1],
+        "email": row[2],
+        "is_staff": bool(row[3]),
+        "role_tag": tag_map.get(row[1], "user"),
+    }
+
+
+def _stream_user_rows(db_path: str, tag_map: dict):
+    # Starlette advances sync iterators on arbitrary threadpool workers, hence check_same_thread=False.
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, check_same_thread=False)
+    try:
+        cursor = conn.execute(_LIST_USERS_SQL)
+        while True:
+            rows = cursor.fetchmany(256)
+            if not rows:
+                break
+            yield b"".join(orjson.dumps(_list_user_payload(r, tag_map)) + b"\n" for r in rows)
+    finally:
+        conn.close()
+
+
 @router.get("/identity-tag")
 def get_user_identity_tag(
     request: Request,
@@ -454,7 +509,6 @@ def login(
     otp: str = Form(default=""),
     db_name: str = Query("system.db")
 ):
-    secure_cookie = os.getenv("NEBULA_COOKIE_SECURE", "false").strip().lower() == "true"
     rate_keys = _login_rate_keys(request, username)
     retry_after = _login_rate_retry_after(rate_keys)
     if retry_after > 0:
@@ -513,7 +567,7 @@ def login(
         if two_factor_enabled:
             if not otp or len(otp.strip()) == 0:
                 raise HTTPException(status_code=401, detail="2FA_REQUIRED")
-            if not _verify_totp_code(two_factor_secret, otp):
+            if not verify_totp_code(two_factor_secret, otp, row_totp_digest(row)):
                 raise HTTPException(status_code=401, detail="INVALID_2FA_CODE")
 
         session_token = create_session_token(username=username, db_name=resolved_db)
@@ -523,7 +577,7 @@ def login(
             httponly=True,
             max_age=3600,
             samesite="Lax",
-            secure=secure_cookie,
+            secure=SECURE_COOKIE,
         )
         _login_rate_success(rate_keys)
         ip_meta = security_service.observe_user_ip(username, resolved_db, _resolve_requester_ip(request))
@@ -720,14 +774,16 @@ def user_2fa_setup(request: Request):
 
         secret = pyotp.random_base32()
         conn.execute(
-            "UPDATE users SET two_factor_secret = ?, two_factor_enabled = 0 WHERE username = ?",
-            (secret, username),
+            "UPDATE users SET two_factor_secret = ?, two_factor_digest = ?, two_factor_enabled = 0 WHERE username = ?",
+            (secret, TOTP_DIGEST, username),
         )
         conn.commit()
+        # The previous secret, if any, is replaced and must not linger in the generator cache.
+        forget_totp(row["two_factor_secret"] if "two_factor_secret" in row.keys() else None)
 
         issuer = "Nebula Panel"
         account = f"{username}@{db_name.replace('.db', '')}"
-        otpauth_uri = pyotp.TOTP(secret).provisioning_uri(name=account, issuer_name=issuer)
+        otpauth_uri = totp_for(secret, TOTP_DIGEST).provisioning_uri(name=account, issuer_name=issuer)
         return {"secret": secret, "otpauth_uri": otpauth_uri}
 
 
@@ -742,7 +798,7 @@ def user_2fa_confirm(request: Request, code: str = Form(...)):
         secret = row["two_factor_secret"] if "two_factor_secret" in row.keys() else None
         if not secret:
             raise HTTPException(status_code=400, detail="2FA_SETUP_NOT_STARTED")
-        if not _verify_totp_code(secret, code):
+        if not verify_totp_code(secret, code, row_totp_digest(row)):
             raise HTTPException(status_code=400, detail="INVALID_2FA_CODE")
 
         conn.execute("UPDATE users SET two_factor_enabled = 1 WHERE username = ?", (username,))
@@ -761,14 +817,15 @@ def user_2fa_disable(request: Request, code: str = Form(...)):
         if not ("two_factor_enabled" in row.keys() and bool(row["two_factor_enabled"])):
             return {"status": "already_disabled"}
         secret = row["two_factor_secret"] if "two_factor_secret" in row.keys() else None
-        if not _verify_totp_code(secret, code):
+        if not verify_totp_code(secret, code, row_totp_digest(row)):
             raise HTTPException(status_code=400, detail="INVALID_2FA_CODE")
 
         conn.execute(
-            "UPDATE users SET two_factor_enabled = 0, two_factor_secret = NULL WHERE username = ?",
+            "UPDATE users SET two_factor_enabled = 0, two_factor_secret = NULL, two_factor_digest = NULL WHERE username = ?",
             (username,),
         )
         conn.commit()
+        forget_totp(secret)
         return {"status": "disabled"}
 
 @router.post("/create")
@@ -907,61 +964,46 @@ def update_user(data: dict, request: Request, _=Depends(verify_staff_or_internal
                 )
                 return {"status": "updated", "location": "local"}
 
-            with get_client_db(normalized_target_db) as conn_dst:
-                exists = conn_dst.execute("SELECT id FROM users WHERE username=?", (new_name,)).fetchone()
-                if exists:
-                    raise HTTPException(status_code=400, detail="Identity collision in target sector")
-
-                try:
-                    conn_dst.execute(
+            source_path, _ = resolve_client_db_path(normalized_source_db)
+            target_path, _ = resolve_client_db_path(normalized_target_db)
+            try:
+                _move_user_row(source_path, target_path, old_name, (new_name, new_email, p_hash, is_staff, is_active))
+                with get_connection(SYSTEM_DB) as sys_conn:
+                    sys_conn.execute(
                         """
-                        INSERT INTO users (username, email, password_hash, is_staff)
-                        VALUES (?, ?, ?, ?)
+                        INSERT INTO user_identity_tags (db_name, username, role_tag, updated_by, updated_at)
+                        VALUES (?, ?, ?, ?, datetime('now'))
+                        ON CONFLICT(db_name, username) DO UPDATE SET
+                            role_tag=excluded.role_tag,
+                            updated_by=excluded.updated_by,
+                            updated_at=datetime('now')
                         """,
-                        (new_name, new_email, p_hash, is_staff),
+                        (normalized_target_db, new_name, role_tag, "system"),
                     )
-                    conn_dst.execute(
-                        "UPDATE users SET is_active = ? WHERE username = ?",
-                        (is_active, new_name),
-                    )
-                    conn_dst.commit()
-
-                    conn_src.execute("DELETE FROM users WHERE username=?", (old_name,))
-                    conn_src.commit()
-                    with get_connection(SYSTEM_DB) as sys_conn:
-                        sys_conn.execute(
-                            """
-                            INSERT INTO user_identity_tags (db_name, username, role_tag, updated_by, updated_at)
-                            VALUES (?, ?, ?, ?, datetime('now'))
-                            ON CONFLICT(db_name, username) DO UPDATE SET
-                                role_tag=excluded.role_tag,
-                                updated_by=excluded.updated_by,
-                                updated_at=datetime('now')
-                            """,
-                            (normalized_target_db, new_name, role_tag, "system"),
-                        )
-                        sys_conn.execute(
-                            "DELETE FROM user_identity_tags WHERE db_name = ? AND username = ?",
-                            (normalized_source_db, old_name),
-                        )
-                    security_service.append_audit_event(
-                        event_kind="user",
-                        action="user.migrate",
-                        summary=f"Moved user {old_name} to {normalized_target_db}",
-                        severity="info",
-                        risk_level="high",
-                        username=new_name,
-                        db_name=normalized_target_db,
-                        actor=_session_from_request(request)[0],
-                        actor_db="system.db",
-                        source_ip=_resolve_requester_ip(request),
-                        target_type="user",
-                        target_id=new_name,
-                        details={"old_username": old_name, "source_db": normalized_source_db, "target_db": normalized_target_db, "role_tag": role_tag},
+                    sys_conn.execute(
+                        "DELETE FROM user_identity_tags WHERE db_name = ? AND username = ?",
+                        (normalized_source_db, old_name),
                     )
-                    return {"status": "moved", "location": normalized_target_db}
-                except Exception as e:
-                    raise HTTPException(status_code=500, detail=f"Migration fatal error: {str(e)}")
+                security_service.append_audit_event(
+                    event_kind="user",
+                    action="user.migrate",
+                    summary=f"Moved user {old_name} to {normalized_target_db}",
+                    severity="info",
+                    risk_level="high",
+                    username=new_name,
+                    db_name=normalized_target_db,
+                    actor=_session_from_request(request)[0],
+                    actor_db="system.db",
+                    source_ip=_resolve_requester_ip(request),
+                    target_type="user",
+                    target_id=new_name,
+                    details={"old_username": old_name, "source_db": normalized_source_db, "target_db": normalized_target_db, "role_tag": role_tag},
+                )
+                return {"status": "moved", "location": normalized_target_db}
+            except HTTPException:
+                raise
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Migration fatal error: {str(e)}")
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -1,13 +1,59 @@
 # nebula_core/core/cgroup_v2.py
 # Copyright (c) 2026 Monolink Systems
 # Licensed under AGPLv3 (Nebula Open Source Edition, non-corporate)
+import ctypes
+import ctypes.util
+import os
 import re
 import time
 from pathlib import Path
 from typing import Dict, Optional, Tuple
 
 
-GROUP_RE = re.compile(r"[^a-zA-Z0-9._-]+")
+GROUP_RE = re.compile(r"[^a-zA-Z0-9._-]+", re.ASCII)
+SUBTREE_CONTROLLERS = ("cpu", "memory", "pids")
+
+_IN_MODIFY = 0x00000002
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = 0o2000000
+_libc = None
+
+
+def _inotify_libc():
+    global _libc
+    if _libc is None:
+        try:
+            _libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+            _libc.inotify_init1
+        except (OSError, AttributeError):
+            _libc = False
+    return _libc or None
+
+
+class MemoryEventsWatch:
+    """inotify watch on a cgroup's memory.events; the fd turns readable when the kernel updates it."""
+
+    def __init__(self, fd: int, path: str):
+        self.fd = fd
+        self.path = path
+
+    def fileno(self) -> int:
+        return self.fd
+
+    def drain(self):
+        while True:
+            try:
+                if not os.read(self.fd, 4096):
+                    return
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return
+
+    def close(self):
+        fd, self.fd = self.fd, -1
+        if fd >= 0:
+            os.close(fd)
 
 
 class CgroupV2Manager:
@@ -77,14 +123,12 @@ class CgroupV2Manager:
         if not path:
             return
         target = Path(path)
-        if not target.exists():
-            return
         try:
-            procs_file = target / "cgroup.procs"
-            if procs_file.exists():
-                pids = [p.strip() for p in procs_file.read_text(encoding="utf-8").splitlines() if p.strip()]
-                if pids:
+            try:
+                if (target / "cgroup.procs").read_bytes().split():
                     return
+            except FileNotFoundError:
+                pass
             target.rmdir()
         except Exception:
             pass
@@ -94,28 +138,41 @@ class CgroupV2Manager:
         out: Dict[str, int] = {}
         if not path:
             return out
-        target = Path(path) / "memory.events"
-        if not target.exists():
+        try:
+            raw = (Path(path) / "memory.events").read_bytes()
+        except FileNotFoundError:
             return out
-        for line in target.read_text(encoding="utf-8").splitlines():
-            parts = line.split()
-            if len(parts) != 2:
-                continue
-            try:
-                out[parts[0]] = int(parts[1])
-            except Exception:
-                continue
-        return out
+        return {
+            parts[0].decode("ascii"): int(parts[1])
+            for parts in map(bytes.split, raw.splitlines())
+            if len(parts) == 2 and parts[1].isdigit()
+        }
+
+    @staticmethod
+    def watch_memory_events(path: Optional[str]) -> Optional[MemoryEventsWatch]:
+        """Return an inotify watch on memory.events, or None when inotify is unavailable."""
+        if not path:
+            return None
+        libc = _inotify_libc()
+        if libc is None:
+            return None
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            return None
+        target = os.path.join(str(path), "memory.events")
+        if libc.inotify_add_watch(fd, target.encode("utf-8"), _IN_MODIFY) < 0:
+            os.close(fd)
+            return None
+        return MemoryEventsWatch(fd, str(path))
 
     def _resolve_root_path(self) -> Path:
         if self.root_cfg != "auto":
             return Path(self.root_cfg).resolve()
 
-        rel = "/"
-        for line in Path("/proc/self/cgroup").read_text(encoding="utf-8").splitlines():
-            if line.startswith("0::"):
-                rel = line.split("0::", 1)[1].strip() or "/"
-                break
+        # Prefix a newline so the unified-hierarchy entry only matches at a line start.
+        text = "\n" + Path("/proc/self/cgroup").read_text(encoding="utf-8")
+        _, sep, rest = text.partition("\n0::")
+        rel = (rest.partition("\n")[0].strip() if sep else "/") or "/"
         rel = rel.lstrip("/")
         base = Path("/sys/fs/cgroup")
         if not rel:
@@ -128,10 +185,17 @@ class CgroupV2Manager:
         subtree_file = path / "cgroup.subtree_control"
         if not controllers_file.exists() or not subtree_file.exists():
             return
-        available = set(controllers_file.read_text(encoding="utf-8").split())
-        for ctrl in ("cpu", "memory", "pids"):
-            if ctrl not in available:
-                continue
+        available = frozenset(controllers_file.read_text(encoding="utf-8").split())
+        wanted = [ctrl for ctrl in SUBTREE_CONTROLLERS if ctrl in available]
+        if not wanted:
+            return
+        try:
+            subtree_file.write_text(" ".join(f"+{ctrl}" for ctrl in wanted) + "\n", encoding="utf-8")
+            return
+        except Exception:
+            pass
+        # The kernel rejects the whole write if one controller cannot be enabled; retry one by one.
+        for ctrl in wanted:
             try:
                 with subtree_file.open("a", encoding="utf-8") as fh:
                     fh.write(f"+{ctrl}\n")
@@ -140,6 +204,15 @@ class CgroupV2Manager:
 
     def _write_limits(self, path: Path):
         memory_bytes = self.memory_limit_mb * 1024 * 1024
-        (path / "memory.max").write_text(str(memory_bytes), encoding="utf-8")
-        (path / "cpu.max").write_text(f"{self.cpu_quota_us} {self.cpu_period_us}", encoding="utf-8")
-        (path / "pids.max").write_text(str(self.pids_max), encoding="utf-8")
+        base = str(path)
+        limits = (
+            ("memory.max", f"{memory_bytes}".encode("ascii")),
+            ("cpu.max", f"{self.cpu_quota_us} {self.cpu_period_us}".encode("ascii")),
+            ("pids.max", f"{self.pids_max}".encode("ascii")),
+        )
+        for name, value in limits:
+            fd = os.open(os.path.join(base, name), os.O_WRONLY)
+            try:
+                os.write(fd, value)
+            finally:
+                os.close(fd)
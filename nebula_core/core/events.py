@@ -4,22 +4,24 @@
 import asyncio
 import inspect
 import logging
-from typing import Any, Awaitable, Callable, Dict, List, Tuple
+from typing import Any, Awaitable, Callable, Dict, Tuple
 
 Listener = Callable[[Any], Awaitable[None]]  # async callable that accepts payload
 
 
 class EventBus:
     def __init__(self, logger: logging.Logger = None):
-        self._listeners: Dict[str, List[Tuple[Listener, bool]]] = {}
-        # tuple(listener, once_flag)
+        self._listeners: Dict[str, Tuple[Tuple[Listener, bool, bool], ...]] = {}
+        # tuple(listener, once_flag, is_coro) - is_coro is resolved once at subscribe time.
+        # Listener tables are immutable tuples swapped under _lock, so emit() reads them without locking.
         self._lock = asyncio.Lock()
         self._logger = logger or logging.getLogger("nebula_core.events")
 
     async def subscribe(self, event_name: str, listener: Listener, *, once: bool = False):
         """Register async listener for event_name. If once=True, listener is removed after first call."""
         async with self._lock:
-            self._listeners.setdefault(event_name, []).append((listener, once))
+            is_coro = inspect.iscoroutinefunction(listener)
+            self._listeners[event_name] = self._listeners.get(event_name, ()) + ((listener, once, is_coro),)
             self._logger.debug("Listener subscribed to %s (once=%s)", event_name, once)
 
     async def on(self, event_name: str, listener: Listener, *, once: bool = False):
@@ -30,25 +32,29 @@ class EventBus:
         async with self._lock:
             if event_name not in self._listeners:
                 return
-            before = len(self._listeners[event_name])
-            self._listeners[event_name] = [(l, o) for (l, o) in self._listeners[event_name] if l != listener]
-            after = len(self._listeners[event_name])
+            current = self._listeners[event_name]
+            remaining = tuple(entry for entry in current if entry[0] != listener)
+            self._listeners[event_name] = remaining
+            before, after = len(current), len(remaining)
             self._logger.debug("Listener unsubscribed from %s (%d -> %d)", event_name, before, after)
 
     async def emit(self, event_name: str, payload: Any = None):
         """Emit event asynchronously to all listeners. Errors in listeners are caught and logged."""
-        # copy listeners to avoid race issues if listeners mutate during emit
-        async with self._lock:
-            listeners = list(self._listeners.get(event_name, []))
+        # the table is never mutated in place, so this snapshot is safe while listeners (un)subscribe
+        listeners = self._listeners.get(event_name, ())
         if not listeners:
             self._logger.debug("No listeners for event: %s", event_name)
             return
 
-        async def _call_listener(lst, pl, ev, once_flag):
+        async def _call_listener(lst, pl, ev, once_flag, is_coro):
             try:
-                result = lst(pl)
-                if inspect.isawaitable(result):
-                    await result
+                if is_coro:
+                    await lst(pl)
+                else:
+                    # partials, async __call__ objects and decorated coroutines still hand back awaitables
+                    res = lst(pl)
+                    if inspect.isawaitable(res):
+                        await res
             except Exception as e:
                 self._logger.exception("Error in listener for %s: %s", ev, e)
             finally:
@@ -56,7 +62,7 @@ class EventBus:
                     await self.unsubscribe(ev, lst)
 
         await asyncio.gather(
-            *(_call_listener(listener, payload, event_name, once) for (listener, once) in listeners)
+            *(_call_listener(listener, payload, event_name, once, is_coro) for (listener, once, is_coro) in listeners)
         )
 
     async def clear(self, event_name: str):
@@ -1,28 +1,52 @@
 # nebula_core/core/loader.py
 # Copyright (c) 2026 Monolink Systems
 # Licensed under AGPLv3 (Nebula Open Source Edition, non-corporate)
+import asyncio
+import functools
 import importlib
+import importlib.util
 import inspect
 import logging
+import os
 import pkgutil
+from concurrent.futures import ThreadPoolExecutor
 from types import ModuleType
-from typing import List
+from typing import List, Tuple
 
 MODULES_PACKAGE = "nebula_core.modules"
+# Opt-in: import modules on a thread pool. Leave off if any module does
+# non-thread-safe work at import time.
+PARALLEL_LOAD = os.getenv("NEBULA_PARALLEL_LOAD", "0").strip().lower() in {"1", "true", "yes", "on"}
 
 logger = logging.getLogger("nebula_core.loader")
 
 
+@functools.lru_cache(maxsize=1)
+def _discover_cached(package_name: str, search_path: Tuple[str, ...], mtime_ns: int) -> Tuple[str, ...]:
+    # mtime_ns only keys the cache: adding or removing a module bumps the directory mtime.
+    return tuple(name for _, name, _ in pkgutil.iter_modules(list(search_path), package_name + "."))
+
+
 def discover_modules() -> List[str]:
     """Return list of module names under nebula_core.modules package."""
+    # find_spec locates the package without executing it; it is only imported
+    # later, by load_module, if it actually has submodules.
     try:
-        package = importlib.import_module(MODULES_PACKAGE)
+        spec = importlib.util.find_spec(MODULES_PACKAGE)
     except ModuleNotFoundError:
+        spec = None
+    if spec is None or spec.submodule_search_locations is None:
         logger.debug("Modules package not found: %s", MODULES_PACKAGE)
         return []
 
-    prefix = package.__name__ + "."
-    found = [name for _, name, _ in pkgutil.iter_modules(package.__path__, prefix)]
+    search_path = tuple(spec.submodule_search_locations)
+    mtime_ns = 0
+    for path in search_path:
+        try:
+            mtime_ns = max(mtime_ns, os.stat(path).st_mtime_ns)
+        except OSError:
+            continue
+    found = list(_discover_cached(MODULES_PACKAGE, search_path, mtime_ns))
     logger.debug("Discovered modules: %s", found)
     return found
 
@@ -38,23 +62,45 @@ def load_module(module_name: str) -> ModuleType | None:
         return None
 
 
+def load_modules(module_names: List[str]) -> List[ModuleType | None]:
+    """Import modules in order, on a thread pool when NEBULA_PARALLEL_LOAD is set."""
+    if not PARALLEL_LOAD or len(module_names) < 2:
+        return [load_module(name) for name in module_names]
+    with ThreadPoolExecutor(max_workers=min(8, len(module_names)), thread_name_prefix="nebula-loader") as pool:
+        return list(pool.map(load_module, module_names))
+
+
 async def register_modules(event_bus):
-    """Discover modules and call register(event_bus) if present."""
+    """Discover modules and call register(event_bus) if present.
+
+    Sync entrypoints run inline in discovery order; async ones are awaited
+    together so their I/O overlaps.
+    """
     module_names = discover_modules()
-    for name in module_names:
-        mod = load_module(name)
+    pending_names: List[str] = []
+    pending = []
+    for name, mod in zip(module_names, load_modules(module_names)):
         if not mod:
             continue
         register = getattr(mod, "register", None)
         if callable(register):
+            if inspect.iscoroutinefunction(inspect.unwrap(register)):
+                pending.append(register(event_bus))
+                pending_names.append(name)
+                continue
             try:
-                # if register is async, await it; else call normally
-                if inspect.iscoroutinefunction(register):
-                    await register(event_bus)
-                else:
-                    register(event_bus)
+                register(event_bus)
                 logger.info("Registered module: %s", name)
             except Exception as e:
                 logger.exception("Error registering module %s: %s", name, e)
         else:
             logger.debug("Module %s has no register(event_bus) entrypoint", name)
+
+    if not pending:
+        return
+    results = await asyncio.gather(*pending, return_exceptions=True)
+    for name, result in zip(pending_names, results):
+        if isinstance(result, BaseException):
+            logger.error("Error registering module %s: %s", name, result, exc_info=result)
+        else:
+            logger.info("Registered module: %s", name)
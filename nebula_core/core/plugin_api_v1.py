@@ -1,12 +1,12 @@
 # Copyright (c) 2026 Monolink Systems
 # Licensed under AGPLv3 (Nebula Open Source Edition, non-corporate)
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Dict, List, Optional, Protocol, runtime_checkable
 
 
 PLUGIN_API_VERSION = "v1"
 
-ALLOWED_SCOPES = {
+ALLOWED_SCOPES = frozenset({
     "users.read",
     "users.write",
     "roles.read",
@@ -14,7 +14,7 @@ ALLOWED_SCOPES = {
     "identity_tags.read",
     "identity_tags.write",
     "events.emit",
-}
+})
 
 
 class PluginError(RuntimeError):
@@ -30,13 +30,13 @@ class PluginManifest:
     name: str
     version: str = "0.1.0"
     description: str = ""
-    scopes: List[str] = None
+    scopes: List[str] = field(default_factory=list)
     api_version: str = PLUGIN_API_VERSION
     source: str = "in_process"
 
     def sanitized_scopes(self) -> List[str]:
-        items = self.scopes or []
-        return [s for s in items if s in ALLOWED_SCOPES]
+        # Sorted so manifests that list the same scopes in a different order report them identically.
+        return sorted(frozenset(self.scopes or ()) & ALLOWED_SCOPES)
 
 
 @runtime_checkable
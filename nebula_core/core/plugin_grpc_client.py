@@ -1,33 +1,201 @@
 # nebula_core/core/plugin_grpc_client.py
 # Copyright (c) 2026 Monolink Systems
 # Licensed under AGPLv3 (Nebula Open Source Edition, non-corporate)
-import json
+import asyncio
+import functools
+import itertools
 import logging
 import os
+import threading
 import time
-from typing import Optional
-from urllib.parse import urlparse
-
-import grpc
-from google.protobuf import empty_pb2, struct_pb2
-from google.protobuf.json_format import MessageToJson, ParseDict
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Sequence, Tuple
 
 SERVICE_NAME = "nebula.plugin.v1.PluginService"
 METHOD_HEALTH = f"/{SERVICE_NAME}/Health"
 METHOD_SYNC_USERS = f"/{SERVICE_NAME}/SyncUsers"
+DEFAULT_CHANNEL_POOL_SIZE = 4
+BREAKER_BASE_BACKOFF_SEC = 0.5
+BREAKER_MAX_BACKOFF_SEC = 60.0
+HEALTH_CACHE_TTL_SEC = 2.0
+HEALTH_CACHE_MAX_TTL_SEC = 30.0
+# Keep pooled HTTP/2 connections warm so idle proxies do not force a fresh handshake.
+_CHANNEL_OPTS = (
+    ("grpc.keepalive_time_ms", 60000),
+    ("grpc.keepalive_timeout_ms", 20000),
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.max_pings_without_data", 0),
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _rpc() -> SimpleNamespace:
+    """Import grpc/protobuf on first use so installs without gRPC plugins never load them."""
+    import grpc
+    import grpc.aio
+    from google.protobuf import empty_pb2, struct_pb2
+    from google.protobuf.json_format import MessageToDict
+
+    return SimpleNamespace(
+        grpc=grpc,
+        empty_pb2=empty_pb2,
+        struct_pb2=struct_pb2,
+        MessageToDict=MessageToDict,
+    )
+
+
+def _serialize(message) -> bytes:
+    # Shared by every stub; protobuf's unbound SerializeToString would pin one message type.
+    if isinstance(message, bytes):
+        return message
+    return message.SerializeToString()
+
+
+def _cache_ttl(metadata, default: float) -> float:
+    """Read `cache-control: max-age=N` from trailing metadata, falling back to `default`."""
+    for key, value in metadata or ():
+        if key.lower() != "cache-control":
+            continue
+        if isinstance(value, bytes):
+            value = value.decode("ascii", "ignore")
+        for directive in str(value).split(","):
+            name, _, raw = directive.strip().partition("=")
+            if name.lower() == "no-cache":
+                return 0.0
+            if name.lower() == "max-age":
+                try:
+                    return max(0.0, min(HEALTH_CACHE_MAX_TTL_SEC, float(raw)))
+                except ValueError:
+                    return default
+    return default
+
+
+def _rpc_status(exc: Exception) -> str:
+    code = getattr(exc, "code", None)
+    if callable(code):
+        try:
+            return code().name
+        except Exception:
+            pass
+    return "ERROR"
+
+
+class _ChannelPool:
+    """Fixed set of grpc.aio channels to one endpoint; RPCs are spread round-robin across them.
+
+    aio channels bind to the running event loop, so a pool must be created from inside it.
+    """
+
+    def __init__(self, endpoint: str, size: int):
+        rpc = _rpc()
+        deserialize_struct = rpc.struct_pb2.Struct.FromString
+        self._channels = []
+        self._health_calls = []
+        self._sync_users_calls = []
+        for channel_id in range(max(1, int(size))):
+            # A distinct channel arg keeps gRPC from collapsing the pool onto one shared subchannel.
+            channel = rpc.grpc.aio.insecure_channel(
+                endpoint, options=[*_CHANNEL_OPTS, ("nebula.channel_id", channel_id)]
+            )
+            self._channels.append(channel)
+            self._health_calls.append(
+                channel.unary_unary(
+                    METHOD_HEALTH,
+                    request_serializer=_serialize,
+                    response_deserializer=deserialize_struct,
+                )
+            )
+            self._sync_users_calls.append(
+                channel.unary_unary(
+                    METHOD_SYNC_USERS,
+                    request_serializer=_serialize,
+                    response_deserializer=deserialize_struct,
+                )
+            )
+        self._size = len(self._channels)
+        # next() on itertools.count is atomic under the GIL, so no lock is needed to pick a slot.
+        self._counter = itertools.count()
+
+    def _next_index(self) -> int:
+        return next(self._counter) % self._size
+
+    def next_health(self):
+        return self._health_calls[self._next_index()]
+
+    def next_sync_users(self):
+        return self._sync_users_calls[self._next_index()]
+
+    async def close(self):
+        channels = self._channels
+        self._channels = []
+        self._health_calls = []
+        self._sync_users_calls = []
+        await asyncio.gather(*(channel.close() for channel in channels), return_exceptions=True)
+
+
+# Channel pools are shared per (endpoint, event loop) by every client for that endpoint, so
+# plugins that differ only by token multiplex over the same HTTP/2 connections.
+_SHARED_POOLS: Dict[Tuple[str, asyncio.AbstractEventLoop], Tuple[_ChannelPool, int]] = {}
+_SHARED_POOLS_LOCK = threading.Lock()
+
+
+def _acquire_shared_pool(endpoint: str, size: int) -> _ChannelPool:
+    key = (endpoint, asyncio.get_running_loop())
+    with _SHARED_POOLS_LOCK:
+        entry = _SHARED_POOLS.get(key)
+        pool = entry[0] if entry is not None else _ChannelPool(endpoint, size)
+        _SHARED_POOLS[key] = (pool, (entry[1] if entry is not None else 0) + 1)
+    return pool
+
+
+async def _release_shared_pool(endpoint: str, pool: _ChannelPool):
+    last_ref = False
+    with _SHARED_POOLS_LOCK:
+        for key, (shared, refs) in list(_SHARED_POOLS.items()):
+            if key[0] != endpoint or shared is not pool:
+                continue
+            if refs <= 1:
+                del _SHARED_POOLS[key]
+                last_ref = True
+            else:
+                _SHARED_POOLS[key] = (shared, refs - 1)
+            break
+        else:
+            last_ref = True
+    if last_ref:
+        await pool.close()
 
 
 class GrpcPluginClient:
-    def __init__(self, endpoint: str, token: str = "", allow_remote: bool = False):
+    def __init__(
+        self,
+        endpoint: str,
+        token: str = "",
+        allow_remote: bool = False,
+        pool_size: int = DEFAULT_CHANNEL_POOL_SIZE,
+    ):
         self.endpoint = str(endpoint or "").strip()
         self.token = token or ""
         self.allow_remote = bool(allow_remote)
-        self._channel = None
-        self._health_call = None
-        self._sync_users_call = None
+        self.pool_size = max(1, int(pool_size))
+        # The endpoint never changes, so the policy check runs once; errors surface on first RPC.
+        self._endpoint_error: Optional[str] = None
+        try:
+            self._check_endpoint()
+        except ValueError as exc:
+            self._endpoint_error = str(exc) or "Invalid gRPC plugin endpoint"
+        self._pool: Optional[_ChannelPool] = None
+        self._sync_request = None
+        # (expires_at, payload) of the last successful Health RPC.
+        self._health_cache: Optional[Tuple[float, dict]] = None
+        # Circuit breaker state, on the monotonic clock so NTP steps cannot stretch or skip a window.
+        self._breaker_lock = threading.Lock()
         self._disabled_until = 0.0
+        self._consecutive_failures = 0
+        # (method, status) -> [calls, total_sec, max_sec]
+        self._rpc_stats: Dict[Tuple[str, str], List[float]] = {}
 
-    def _validate_endpoint(self):
+    def _check_endpoint(self):
         candidate = self.endpoint
         if candidate.startswith("unix://"):
             socket_path = candidate[len("unix://"):].strip()
@@ -36,6 +204,8 @@ class GrpcPluginClient:
             return
 
         if "://" in candidate:
+            from urllib.parse import urlparse
+
             parsed = urlparse(candidate)
             host = parsed.hostname or ""
             port = parsed.port
@@ -52,66 +222,177 @@ class GrpcPluginClient:
         if not self.allow_remote and host not in ("127.0.0.1", "localhost", "::1"):
             raise ValueError("Remote gRPC plugin endpoints are disabled by policy")
 
-    def _ensure_channel(self):
-        if self._channel is not None:
-            return
+    def _validate_endpoint(self):
+        if self._endpoint_error is not None:
+            raise ValueError(self._endpoint_error)
+
+    def _ensure_channel(self) -> _ChannelPool:
+        if self._pool is not None:
+            return self._pool
         self._validate_endpoint()
-        self._channel = grpc.insecure_channel(self.endpoint)
-        self._health_call = self._channel.unary_unary(
-            METHOD_HEALTH,
-            request_serializer=lambda msg: msg.SerializeToString(),
-            response_deserializer=struct_pb2.Struct.FromString,
-        )
-        self._sync_users_call = self._channel.unary_unary(
-            METHOD_SYNC_USERS,
-            request_serializer=lambda msg: msg.SerializeToString(),
-            response_deserializer=struct_pb2.Struct.FromString,
-        )
+        self._pool = _acquire_shared_pool(self.endpoint, self.pool_size)
+        return self._pool
 
     def _metadata(self):
         if self.token:
             return (("x-nebula-token", self.token),)
         return None
 
-    def _mark_failure(self):
-        self._disabled_until = time.time() + 10.0
-        self.close()
+    def _backoff(self) -> float:
+        return min(BREAKER_MAX_BACKOFF_SEC, BREAKER_BASE_BACKOFF_SEC * 2 ** self._consecutive_failures)
+
+    async def _mark_failure(self):
+        with self._breaker_lock:
+            self._consecutive_failures += 1
+            self._disabled_until = time.monotonic() + self._backoff()
+        self._health_cache = None
+        await self.close()
+
+    def _mark_success(self):
+        if not self._consecutive_failures:
+            return
+        with self._breaker_lock:
+            self._consecutive_failures = 0
+            self._disabled_until = 0.0
+
+    def _record(self, method: str, status: str, started: float):
+        elapsed = time.monotonic() - started
+        entry = self._rpc_stats.get((method, status))
+        if entry is None:
+            self._rpc_stats[(method, status)] = [1, elapsed, elapsed]
+            return
+        entry[0] += 1
+        entry[1] += elapsed
+        if elapsed > entry[2]:
+            entry[2] = elapsed
+
+    def rpc_stats(self) -> dict:
+        """Per-method call counts and latency by status: OK, a gRPC status code name, ERROR or BREAKER_OPEN."""
+        out: Dict[str, dict] = {}
+        for (method, status), (calls, total, peak) in sorted(self._rpc_stats.items()):
+            out.setdefault(method, {})[status] = {
+                "calls": int(calls),
+                "avg_ms": round(total / calls * 1000.0, 3),
+                "max_ms": round(peak * 1000.0, 3),
+            }
+        return out
 
     def _can_attempt(self):
-        return time.time() >= self._disabled_until
+        now = time.monotonic()
+        if not self._consecutive_failures and now >= self._disabled_until:
+            return True
+        with self._breaker_lock:
+            if now < self._disabled_until:
+                return False
+            if self._consecutive_failures:
+                # Half-open: this caller probes the endpoint, concurrent callers wait out another window.
+                self._disabled_until = now + self._backoff()
+            return True
 
-    def health(self, timeout: float = 3.0) -> Optional[dict]:
+    async def health(self, timeout: float = 3.0) -> Optional[dict]:
+        cached = self._health_cache
+        if cached is not None and time.monotonic() < cached[0]:
+            return dict(cached[1])
+        started = time.monotonic()
         if not self._can_attempt():
+            self._record("health", "BREAKER_OPEN", started)
             return None
         try:
-            self._ensure_channel()
-            response = self._health_call(empty_pb2.Empty(), timeout=timeout, metadata=self._metadata())
-            return json.loads(MessageToJson(response))
+            pool = self._ensure_channel()
+            rpc = _rpc()
+            call = pool.next_health()(rpc.empty_pb2.Empty(), timeout=timeout, metadata=self._metadata())
+            response = await call
+            self._mark_success()
+            self._record("health", "OK", started)
+            result = rpc.MessageToDict(response)
+            ttl = _cache_ttl(await call.trailing_metadata(), HEALTH_CACHE_TTL_SEC)
+            if ttl > 0:
+                self._health_cache = (time.monotonic() + ttl, result)
+            return dict(result)
         except Exception as exc:
             logging.getLogger("nebula_core.plugins.grpc").warning("Plugin gRPC health failed: %s", exc)
-            self._mark_failure()
+            self._record("health", _rpc_status(exc), started)
+            await self._mark_failure()
             return None
 
-    def sync_users(self, payload: Optional[dict] = None, timeout: float = 10.0) -> Optional[dict]:
+    async def sync_users(self, payload: Optional[dict] = None, timeout: float = 10.0) -> Optional[dict]:
+        started = time.monotonic()
         if not self._can_attempt():
+            self._record("sync_users", "BREAKER_OPEN", started)
             return None
         try:
-            self._ensure_channel()
-            request = struct_pb2.Struct()
-            ParseDict(payload or {}, request, ignore_unknown_fields=False)
-            response = self._sync_users_call(request, timeout=timeout, metadata=self._metadata())
-            return json.loads(MessageToJson(response))
+            pool = self._ensure_channel()
+            rpc = _rpc()
+            if self._sync_request is None:
+                self._sync_request = rpc.struct_pb2.Struct()
+            # Scratch message reused per call; it is encoded before the next await so
+            # concurrent calls on the loop never see each other's payload.
+            request = self._sync_request
+            request.Clear()
+            request.update(payload or {})
+            body = request.SerializeToString()
+            response = await pool.next_sync_users()(body, timeout=timeout, metadata=self._metadata())
+            self._mark_success()
+            self._record("sync_users", "OK", started)
+            return rpc.MessageToDict(response)
         except Exception as exc:
             logging.getLogger("nebula_core.plugins.grpc").warning("Plugin gRPC sync_users failed: %s", exc)
-            self._mark_failure()
+            self._record("sync_users", _rpc_status(exc), started)
+            await self._mark_failure()
+            return None
+
+    async def sync_users_batch(self, payloads: Sequence[dict], timeout: float = 10.0) -> Optional[List[dict]]:
+        """Send several sync payloads as one `{"batch": [...]}` SyncUsers RPC.
+
+        The plugin must answer with `{"results": [...]}`, one entry per payload, in order.
+        """
+        if not payloads:
+            return []
+        data = await self.sync_users({"batch": [dict(item or {}) for item in payloads]}, timeout=timeout)
+        if data is None:
+            return None
+        results = data.get("results")
+        if not isinstance(results, list) or len(results) != len(payloads):
+            logging.getLogger("nebula_core.plugins.grpc").warning(
+                "Plugin gRPC sync_users batch returned malformed results for %s payloads", len(payloads)
+            )
             return None
+        return [item if isinstance(item, dict) else {"result": item} for item in results]
+
+    async def close(self):
+        self._health_cache = None
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            await _release_shared_pool(self.endpoint, pool)
+
+
+_CLIENTS: Dict[Tuple[str, str, bool], GrpcPluginClient] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def get_grpc_plugin_client(endpoint: str, token: str = "", allow_remote: bool = False) -> GrpcPluginClient:
+    """Return the process-wide client for (endpoint, token, allow_remote), creating it once.
+
+    Sharing the client keeps its channels and circuit-breaker state alive across callers
+    instead of paying a new connection handshake for every adapter.
+    """
+    key = (str(endpoint or "").strip(), token or "", bool(allow_remote))
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is not None:
+            return client
+        client = GrpcPluginClient(endpoint=key[0], token=key[1], allow_remote=key[2])
+        _CLIENTS[key] = client
+    return client
+
 
-    def close(self):
-        if self._channel is not None:
-            self._channel.close()
-            self._channel = None
-            self._health_call = None
-            self._sync_users_call = None
+async def release_grpc_plugin_client(client: GrpcPluginClient):
+    """Close a shared client and forget it, e.g. when a plugin's per-start token is retired."""
+    key = (client.endpoint, client.token, client.allow_remote)
+    with _CLIENTS_LOCK:
+        if _CLIENTS.get(key) is client:
+            del _CLIENTS[key]
+    await client.close()
 
 
 def resolve_token(token_env: str = "") -> str:
@@ -0,0 +1,252 @@
+# nebula_core/core/plugin_zygote.py
+# Copyright (c) 2026 Monolink Systems
+# Licensed under AGPLv3 (Nebula Open Source Edition, non-corporate)
+"""Pre-warmed parent process for plugin workers.
+
+The zygote imports `plugin_runner` (grpc, protobuf, plugin API) once and then forks one
+worker per request, so starting a plugin costs a fork instead of a fresh interpreter.
+
+Protocol: the manager writes one JSON object per line to the zygote's stdin,
+`{"argv": [...plugin_runner args...]}`, and reads back `{"pid": N}` or `{"error": "..."}`.
+Workers are reaped by the zygote, so their exit status is not visible to the manager.
+"""
+import asyncio
+import json
+import logging
+import os
+import select
+import signal
+import sys
+from typing import List, Optional
+
+logger = logging.getLogger("nebula_core.plugins.zygote")
+
+RUNNER_MODULE = "nebula_core.core.plugin_runner"
+ZYGOTE_MODULE = "nebula_core.core.plugin_zygote"
+UNKNOWN_RETURNCODE = -1
+
+
+class ZygoteProcess:
+    """asyncio.subprocess.Process-like handle for a worker forked by the zygote.
+
+    The worker is not a child of this process, so liveness comes from a pidfd (or
+    signal 0 where pidfds are unavailable) rather than waitpid.
+    """
+
+    def __init__(self, pid: int):
+        self.pid = int(pid)
+        self._returncode: Optional[int] = None
+        self._pidfd: Optional[int] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._exit_waiters: List[asyncio.Future] = []
+        try:
+            # A pidfd pins the process identity, so a recycled pid is never signalled or polled.
+            self._pidfd = os.pidfd_open(self.pid)
+        except ProcessLookupError:
+            self._returncode = UNKNOWN_RETURNCODE
+        except (AttributeError, OSError):
+            self._pidfd = None
+        try:
+            self._watch(asyncio.get_running_loop())
+        except RuntimeError:
+            pass
+
+    def _watch(self, loop: asyncio.AbstractEventLoop) -> bool:
+        # With the pidfd registered on the loop, exit is pushed to _finish and returncode is a plain read.
+        if self._loop is None and self._pidfd is not None:
+            loop.add_reader(self._pidfd, self._finish)
+            self._loop = loop
+        return self._loop is not None
+
+    def _exited(self) -> bool:
+        if self._pidfd is not None:
+            ready, _, _ = select.select([self._pidfd], [], [], 0)
+            return bool(ready)
+        try:
+            os.kill(self.pid, 0)
+        except ProcessLookupError:
+            return True
+        except PermissionError:
+            return False
+        return False
+
+    def _finish(self):
+        self._returncode = UNKNOWN_RETURNCODE
+        if self._pidfd is not None:
+            if self._loop is not None:
+                self._loop.remove_reader(self._pidfd)
+                self._loop = None
+            os.close(self._pidfd)
+            self._pidfd = None
+        waiters, self._exit_waiters = self._exit_waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    @property
+    def returncode(self) -> Optional[int]:
+        if self._returncode is None and self._loop is None and self._exited():
+            self._finish()
+        return self._returncode
+
+    async def wait(self) -> int:
+        if self.returncode is not None:
+            return self._returncode
+        loop = asyncio.get_running_loop()
+        if self._watch(loop):
+            exited = loop.create_future()
+            self._exit_waiters.append(exited)
+            try:
+                await exited
+            finally:
+                if exited in self._exit_waiters:
+                    self._exit_waiters.remove(exited)
+        else:
+            while not self._exited():
+                await asyncio.sleep(0.05)
+            self._finish()
+        return self._returncode
+
+    def send_signal(self, sig: int):
+        if self.returncode is not None:
+            return
+        try:
+            if self._pidfd is not None:
+                signal.pidfd_send_signal(self._pidfd, sig)
+            else:
+                os.kill(self.pid, sig)
+        except ProcessLookupError:
+            pass
+
+    def terminate(self):
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self):
+        self.send_signal(signal.SIGKILL)
+
+
+class PluginZygote:
+    """Manager-side handle: starts the zygote and asks it to fork workers."""
+
+    def __init__(self, python_command: List[str]):
+        self.command = list(python_command) + ["-m", ZYGOTE_MODULE]
+        self._proc: Optional[asyncio.subprocess.Process] = None
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def for_runner_command(cls, runner_command: List[str]) -> Optional["PluginZygote"]:
+        """Build a zygote only for the stock `<python> -m plugin_runner` command; wrappers keep using exec."""
+        if len(runner_command) < 3 or runner_command[-2:] != ["-m", RUNNER_MODULE]:
+            return None
+        return cls(runner_command[:-2])
+
+    def is_running(self) -> bool:
+        return self._proc is not None and self._proc.returncode is None
+
+    async def start(self):
+        if self.is_running():
+            return
+        self._proc = await asyncio.create_subprocess_exec(
+            *self.command,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            close_fds=True,
+            start_new_session=True,
+        )
+        logger.info("Plugin zygote started (pid %s)", self._proc.pid)
+
+    async def spawn(self, runner_args: List[str], timeout: float = 5.0) -> ZygoteProcess:
+        async with self._lock:
+            if not self.is_running():
+                await self.start()
+            proc = self._proc
+            line = json.dumps({"argv": list(runner_args)}).encode("utf-8") + b"\n"
+            try:
+                proc.stdin.write(line)
+                await proc.stdin.drain()
+                raw = await asyncio.wait_for(proc.stdout.readline(), timeout=timeout)
+            except Exception:
+                await self._stop_locked()
+                raise
+            if not raw:
+                await self._stop_locked()
+                raise RuntimeError("plugin zygote exited")
+            reply = json.loads(raw)
+        if "pid" not in reply:
+            raise RuntimeError(str(reply.get("error") or "plugin zygote failed to fork"))
+        return ZygoteProcess(int(reply["pid"]))
+
+    async def _stop_locked(self):
+        proc, self._proc = self._proc, None
+        if proc is None or proc.returncode is not None:
+            return
+        try:
+            proc.stdin.close()
+        except Exception:
+            pass
+        try:
+            await asyncio.wait_for(proc.wait(), timeout=2.0)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+
+    async def close(self):
+        async with self._lock:
+            await self._stop_locked()
+
+
+def _run_worker(argv: List[str]) -> int:
+    from . import plugin_runner
+
+    os.setsid()
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+    if devnull > 2:
+        os.close(devnull)
+    sys.argv = [RUNNER_MODULE, *argv]
+    return plugin_runner.main()
+
+
+def _fork_worker(argv: List[str]) -> int:
+    pid = os.fork()
+    if pid:
+        return pid
+    code = 1
+    try:
+        code = _run_worker(argv)
+    except SystemExit as exc:
+        code = exc.code if isinstance(exc.code, int) else 1
+    except BaseException:
+        code = 1
+    finally:
+        os._exit(code)
+
+
+def main() -> int:
+    # Warm the worker's imports once; forked workers inherit them.
+    from . import plugin_runner  # noqa: F401
+
+    # Workers are reaped automatically; their status is not reported back.
+    signal.signal(signal.SIGCHLD, signal.SIG_IGN)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    stdin = sys.stdin.buffer
+    stdout = sys.stdout.buffer
+    for raw in iter(stdin.readline, b""):
+        try:
+            request = json.loads(raw)
+            argv = [str(item) for item in request.get("argv") or []]
+            reply = {"pid": _fork_worker(argv)}
+        except Exception as exc:
+            reply = {"error": str(exc)}
+        stdout.write(json.dumps(reply).encode("utf-8") + b"\n")
+        stdout.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -11,6 +11,8 @@ from .events import EventBus
 from .loader import register_modules
 from .plugin_manager import PluginManager
 from .service_task import ServiceTask
+from ..db import close_pools
+from ..services.user_service import shutdown_bcrypt_pool
 from ..utils.config import load_yaml_config
 
 logger = logging.getLogger("nebula_core.runtime")
@@ -159,6 +161,9 @@ class NebulaRuntime:
         except Exception:
             logger.exception("Plugin manager shutdown failed")
 
+        shutdown_bcrypt_pool()
+        close_pools()
+
         # Handle remaining background tasks
         if self._tasks:
             logger.info(f"Cancelling {len(self._tasks)} remaining background tasks")
@@ -2,8 +2,10 @@
 
 from __future__ import annotations
 
+import queue
 import re
 import sqlite3
+import threading
 from contextlib import contextmanager
 from pathlib import Path
 from typing import Iterator
@@ -16,6 +18,22 @@ SYSTEM_DB = str(DATABASES_DIR / "system.db")
 
 _DB_NAME_RE = re.compile(r"^[a-zA-Z0-9][a-zA-Z0-9_.-]{0,63}\.db$")
 
+READER_POOL_SIZE = 4
+# Pooled connections are long-lived, so a larger prepared-statement cache keeps every hot query resident.
+STATEMENT_CACHE_SIZE = 256
+_POOL_PRAGMAS = (
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA cache_size = -16384",
+    "PRAGMA busy_timeout = 5000",
+    "PRAGMA foreign_keys = ON",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA mmap_size = 268435456",
+)
+_WRITER_PRAGMAS = (
+    "PRAGMA journal_mode = WAL",
+    "PRAGMA wal_autocheckpoint = 1000",
+)
+
 
 def _ensure_base_dirs() -> None:
     DATABASES_DIR.mkdir(parents=True, exist_ok=True)
@@ -76,6 +94,191 @@ def get_connection(db_path: str) -> Iterator[sqlite3.Connection]:
         conn.close()
 
 
+class SqliteConnectionPool:
+    """One long-lived writer plus up to `readers` read-only connections for a single database file.
+
+    Connections are opened lazily, configured once, and reused, so hot paths skip the
+    open/PRAGMA cost of get_connection. The writer runs in WAL mode so readers never
+    block behind it.
+    """
+
+    def __init__(self, db_path: str, readers: int | None = None):
+        self.db_path = str(db_path)
+        self.max_readers = max(1, int(readers if readers is not None else _reader_pool_size))
+        self._idle: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        self._opened = 0
+        self._open_lock = threading.Lock()
+        self._writer: sqlite3.Connection | None = None
+        self._writer_lock = threading.Lock()
+        self._closed = False
+
+    @staticmethod
+    def _configure(conn: sqlite3.Connection) -> sqlite3.Connection:
+        conn.row_factory = sqlite3.Row
+        for pragma in _POOL_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def _open_reader(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            f"file:{self.db_path}?mode=ro",
+            uri=True,
+            timeout=30,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        try:
+            self._configure(conn)
+            # mode=ro covers the main file; query_only also keeps ATTACHed client databases read-only.
+            conn.execute("PRAGMA query_only = ON")
+            return conn
+        except Exception:
+            conn.close()
+            raise
+
+    def _take_reader(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._open_lock:
+            can_open = self._opened < self.max_readers
+            if can_open:
+                self._opened += 1
+        if not can_open:
+            return self._idle.get(timeout=30)
+        try:
+            return self._open_reader()
+        except Exception:
+            with self._open_lock:
+                self._opened -= 1
+            raise
+
+    def _discard_reader(self, conn: sqlite3.Connection) -> None:
+        with self._open_lock:
+            self._opened -= 1
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    @contextmanager
+    def acquire_reader(self) -> Iterator[sqlite3.Connection]:
+        conn = self._take_reader()
+        try:
+            yield conn
+        except sqlite3.DatabaseError:
+            self._discard_reader(conn)
+            raise
+        except BaseException:
+            self._release_reader(conn)
+            raise
+        else:
+            self._release_reader(conn)
+
+    def _release_reader(self, conn: sqlite3.Connection) -> None:
+        if self._closed or self._opened > self.max_readers:
+            self._discard_reader(conn)
+            return
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    def _open_writer(self) -> sqlite3.Connection:
+        _ensure_base_dirs()
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=30,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        try:
+            self._configure(conn)
+            try:
+                for pragma in _WRITER_PRAGMAS:
+                    conn.execute(pragma)
+            except sqlite3.OperationalError:
+                # Another connection holds a lock; stay on the current journal mode.
+                pass
+        except Exception:
+            conn.close()
+            raise
+        return conn
+
+    def open_writer(self) -> None:
+        """Open the shared writer now so WAL is in place before the first read-only reader attaches."""
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = self._open_writer()
+
+    @contextmanager
+    def acquire_writer(self) -> Iterator[sqlite3.Connection]:
+        """Serialize writers on the shared connection inside a BEGIN IMMEDIATE transaction."""
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = self._open_writer()
+            conn = self._writer
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                self._discard_reader(self._idle.get_nowait())
+            except queue.Empty:
+                break
+        with self._writer_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+
+_reader_pool_size = READER_POOL_SIZE
+_POOLS: dict[str, SqliteConnectionPool] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def get_pool(db_path: str) -> SqliteConnectionPool:
+    """Return the process-wide connection pool for a database file."""
+    key = str(Path(str(db_path)).resolve())
+    pool = _POOLS.get(key)
+    if pool is not None:
+        return pool
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            pool = SqliteConnectionPool(key)
+            _POOLS[key] = pool
+        return pool
+
+
+def set_reader_pool_size(readers: int) -> None:
+    """Resize the idle reader bound for new and existing pools; surplus readers close as they are returned."""
+    global _reader_pool_size
+    with _POOLS_LOCK:
+        _reader_pool_size = max(1, int(readers))
+        for pool in _POOLS.values():
+            pool.max_readers = _reader_pool_size
+
+
+def close_pools() -> None:
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.close()
+
+
 @contextmanager
 def get_client_db(db_name: str, create_if_missing: bool = True) -> Iterator[sqlite3.Connection]:
     db_path, normalized = resolve_client_db_path(db_name)
@@ -90,8 +293,12 @@ __all__ = [
     "SYSTEM_DB",
     "CLIENTS_DIR",
     "DATABASES_DIR",
+    "SqliteConnectionPool",
     "get_connection",
     "get_client_db",
+    "get_pool",
+    "close_pools",
+    "set_reader_pool_size",
     "list_client_databases",
     "normalize_client_db_name",
     "resolve_client_db_path",
@@ -1,10 +1,52 @@
 # nebula_core/services/user_service.py
 # Copyright (c) 2026 Monolink Systems
 # Licensed under AGPLv3 (Nebula Open Source Edition, non-corporate)
+import multiprocessing
+import os
+import threading
 import bcrypt
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Optional
 from ..models.user import User, UserCreate
 
+# bcrypt is CPU-bound; hashing and verification run in worker processes so login storms use every core.
+# NEBULA_BCRYPT_WORKERS=0 keeps hashing inline in the calling thread.
+BCRYPT_WORKERS = max(0, int(os.getenv("NEBULA_BCRYPT_WORKERS", str(os.cpu_count() or 1))))
+_BCRYPT_POOL: Optional[ProcessPoolExecutor] = None
+_BCRYPT_POOL_LOCK = threading.Lock()
+
+
+def _bcrypt_checkpw(plain_password: bytes, stored_hash: bytes) -> bool:
+    return bcrypt.checkpw(plain_password, stored_hash)
+
+
+def _bcrypt_hashpw(password: bytes) -> bytes:
+    return bcrypt.hashpw(password, bcrypt.gensalt())
+
+
+def _bcrypt_pool() -> Optional[ProcessPoolExecutor]:
+    global _BCRYPT_POOL
+    if BCRYPT_WORKERS <= 0:
+        return None
+    if _BCRYPT_POOL is None:
+        with _BCRYPT_POOL_LOCK:
+            if _BCRYPT_POOL is None:
+                # spawn: forking the threaded API server is not safe
+                _BCRYPT_POOL = ProcessPoolExecutor(
+                    max_workers=BCRYPT_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _BCRYPT_POOL
+
+
+def shutdown_bcrypt_pool():
+    global _BCRYPT_POOL
+    with _BCRYPT_POOL_LOCK:
+        pool, _BCRYPT_POOL = _BCRYPT_POOL, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
 class UserService:
     def create_user(self, conn, data: UserCreate) -> User:
         password_hash = self.hash_password(data.password)
@@ -19,17 +61,30 @@ class UserService:
         return User(id=user_id, username=data.username, email=email, roles=[], is_staff=bool(is_staff))
 
     def hash_password(self, password: str) -> bytes:
-        return bcrypt.hashpw(password.encode(), bcrypt.gensalt())
+        pool = _bcrypt_pool()
+        if pool is None:
+            return _bcrypt_hashpw(password.encode())
+        return pool.submit(_bcrypt_hashpw, password.encode()).result()
+
+    def hash_passwords(self, passwords: List[str]) -> List[bytes]:
+        encoded = [p.encode() for p in passwords]
+        pool = _bcrypt_pool()
+        if pool is None:
+            return [_bcrypt_hashpw(p) for p in encoded]
+        return list(pool.map(_bcrypt_hashpw, encoded))
 
     def verify_password(self, plain_password: str, stored_hash) -> bool:
         # stored_hash may be bytes or str depending on DB driver; normalize to bytes
         if isinstance(stored_hash, str):
             stored_hash = stored_hash.encode('utf-8')
-        return bcrypt.checkpw(plain_password.encode(), stored_hash)
+        pool = _bcrypt_pool()
+        if pool is None:
+            return _bcrypt_checkpw(plain_password.encode(), stored_hash)
+        return pool.submit(_bcrypt_checkpw, plain_password.encode(), stored_hash).result()
 
     def authenticate(self, conn, username: str, password: str) -> Optional[User]:
         row = conn.execute("SELECT * FROM users WHERE username=?", (username,)).fetchone()
-        if not row or not bcrypt.checkpw(password.encode(), row["password_hash"]):
+        if not row or not self.verify_password(password, row["password_hash"]):
             return None
         
         roles = self.get_user_roles(conn, row["id"])
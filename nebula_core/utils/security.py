@@ -0,0 +1,87 @@
+# nebula_core/utils/security.py
+# Copyright (c) 2026 Monolink Systems
+# Licensed under AGPLv3 (Nebula Open Source Edition, non-corporate)
+import hashlib
+import hmac
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+import pyotp
+
+TOTP_VALID_WINDOW = max(1, min(int(os.getenv("NEBULA_TOTP_VALID_WINDOW", "2")), 5))
+# Secrets enrolled before the digest column existed keep verifying with SHA1.
+TOTP_LEGACY_DIGEST = "sha1"
+_TOTP_DIGESTS = {"sha1": hashlib.sha1, "sha256": hashlib.sha256}
+TOTP_DIGEST = os.getenv("NEBULA_TOTP_DIGEST", "sha256").strip().lower()
+if TOTP_DIGEST not in _TOTP_DIGESTS:
+    TOTP_DIGEST = "sha256"
+TOTP_CACHE_SIZE = 1024
+_TOTP_CACHE: "OrderedDict[tuple, pyotp.TOTP]" = OrderedDict()
+_TOTP_CACHE_LOCK = threading.Lock()
+
+
+def _normalize_otp_code(raw_code: str) -> str:
+    return re.sub(r"\D", "", str(raw_code or ""))
+
+
+def row_totp_digest(row) -> str:
+    digest = row["two_factor_digest"] if "two_factor_digest" in row.keys() else None
+    return str(digest or TOTP_LEGACY_DIGEST).strip().lower()
+
+
+def totp_for(secret: str, digest: str = TOTP_LEGACY_DIGEST) -> pyotp.TOTP:
+    # LRU keyed by (secret, digest); forget_totp drops one secret when it is revoked.
+    key = (secret, digest)
+    with _TOTP_CACHE_LOCK:
+        totp = _TOTP_CACHE.get(key)
+        if totp is not None:
+            _TOTP_CACHE.move_to_end(key)
+            return totp
+    totp = pyotp.TOTP(secret, digest=_TOTP_DIGESTS.get(digest, hashlib.sha1))
+    with _TOTP_CACHE_LOCK:
+        _TOTP_CACHE[key] = totp
+        while len(_TOTP_CACHE) > TOTP_CACHE_SIZE:
+            _TOTP_CACHE.popitem(last=False)
+    return totp
+
+
+def forget_totp(secret: str) -> None:
+    """Evict the cached generators for one secret, whatever digest they were built with."""
+    if not secret:
+        return
+    secret = str(secret).strip()
+    with _TOTP_CACHE_LOCK:
+        for key in [key for key in _TOTP_CACHE if key[0] == secret]:
+            del _TOTP_CACHE[key]
+
+
+def _totp_window_offsets(window: int) -> tuple:
+    # Current slot first, then fan out: 0, -1, +1, -2, +2, ...
+    offsets = [0]
+    for step in range(1, window + 1):
+        offsets.extend((-step, step))
+    return tuple(offsets)
+
+
+_TOTP_WINDOW_OFFSETS = _totp_window_offsets(TOTP_VALID_WINDOW)
+
+
+def _verify_totp_window(totp: pyotp.TOTP, code: str) -> bool:
+    # Only the comparison has to be constant-time; stop generating codes once a slot matches.
+    now = int(time.time())
+    for offset in _TOTP_WINDOW_OFFSETS:
+        if hmac.compare_digest(totp.at(now, offset), code):
+            return True
+    return False
+
+
+def verify_totp_code(secret: str, raw_code: str, digest: str = TOTP_LEGACY_DIGEST) -> bool:
+    if not secret:
+        return False
+    code = _normalize_otp_code(raw_code)
+    if len(code) != 6:
+        return False
+    return _verify_totp_window(totp_for(str(secret).strip(), digest), code)
@@ -0,0 +1,91 @@
+# tests/test_plugin_grpc_clients.py
+# Copyright (c) 2026 Monolink Systems
+# Licensed under AGPLv3 (Nebula Open Source Edition, non-corporate)
+import asyncio
+import json
+
+from nebula_core.core import plugin_grpc_client
+from nebula_core.core.plugin_manager import PluginManager
+
+PLUGIN_SOURCE = '''
+PLUGIN_API_VERSION = "v1"
+
+
+class Plugin:
+    async def initialize(self, context):
+        pass
+
+    async def health(self):
+        return {"status": "ok"}
+
+    async def shutdown(self):
+        pass
+
+
+def create_plugin():
+    return Plugin()
+'''
+
+RESTARTS = 5
+
+
+def _manager(tmp_path) -> PluginManager:
+    plugin_dir = tmp_path / "plugins" / "echo"
+    plugin_dir.mkdir(parents=True)
+    (plugin_dir / "plugin.py").write_text(PLUGIN_SOURCE, encoding="utf-8")
+    (plugin_dir / "plugin.json").write_text(json.dumps({"api_version": "v1"}), encoding="utf-8")
+    return PluginManager(
+        {
+            "environment": "production",
+            "process_runtime_enabled": True,
+            "scan_path": str(tmp_path / "plugins"),
+            "state_file": str(tmp_path / "state.json"),
+            "runtime_socket_dir": str(tmp_path / "sock"),
+            "runtime_log_dir": str(tmp_path / "logs"),
+            "cgroup_enabled": False,
+            "zygote_enabled": False,
+            "init_timeout_sec": 10,
+        }
+    )
+
+
+def _registry_sizes():
+    # Clients for one socket share a pool entry, so a leak shows up in its reference count.
+    pool_refs = sum(refs for _, refs in plugin_grpc_client._SHARED_POOLS.values())
+    return len(plugin_grpc_client._CLIENTS), pool_refs
+
+
+def _open_channels(rec):
+    # The readiness probe may race the socket and drop its pool; open it as a live caller would.
+    rec.plugin_obj.client._ensure_channel()
+
+
+def test_restarts_release_per_start_grpc_clients(tmp_path):
+    async def scenario():
+        manager = _manager(tmp_path)
+        await manager.rescan()
+        rec = manager._plugins["echo"]
+        assert manager._is_process_alive(rec)
+        _open_channels(rec)
+        assert _registry_sizes() == (1, 1)
+
+        for _ in range(RESTARTS):
+            await manager.plugin_action("echo", "restart")
+            _open_channels(rec)
+            assert _registry_sizes() == (1, 1)
+        for _ in range(RESTARTS):
+            await manager._maybe_restart(rec, reason="test")
+            _open_channels(rec)
+            assert _registry_sizes() == (1, 1)
+        assert manager._is_process_alive(rec)
+
+        await manager.plugin_action("echo", "stop")
+        assert _registry_sizes() == (0, 0)
+        await manager.plugin_action("echo", "start")
+        _open_channels(rec)
+        assert _registry_sizes() == (1, 1)
+
+        await manager.shutdown()
+        assert _registry_sizes() == (0, 0)
+
+    asyncio.run(scenario())